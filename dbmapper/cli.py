@@ -59,6 +59,12 @@ def main():
     help="Glob patterns for files to exclude (in addition to default exclusions for images, binaries, etc.)",
     )
 
+    parser.add_argument(
+        "--git-files",
+        action="store_true",
+        help="Discover files with git ls-files (tracked files only, respects .gitignore) instead of walking the tree",
+    )
+
     parser.add_argument(
         "--languages",
         nargs="+",
@@ -5,48 +5,53 @@ import re
 from pathlib import Path
 from typing import List, Dict, Any
 
+from .line_index import build_line_index, line_number
+
 
 # Entity Framework patterns
-EF_MODEL_PATTERN = r'public\s+class\s+(\w+)\s*:\s*(?:DbContext|IdentityDbContext|BaseEntity)'
-EF_DBCONTEXT_PATTERN = r'public\s+class\s+(\w+)\s*:\s*DbContext'
-EF_DBSET_PATTERN = r'public\s+(?:DbSet|IDbSet)<(\w+)>\s+(\w+)\s*{\s*get;\s*set;\s*}'
-EF_CONNECTION_PATTERN = r'(?i)(?:connectionstring|connection_string)\s*[=:]\s*["\']([^"\']*(?:Data Source|Server|Database)[^"\']*)["\']'
-EF_MIGRATION_PATTERN = r'(?:Add-Migration|Update-Database|migrationBuilder\.CreateTable)'
-EF_RAW_SQL_PATTERN = r'(?:ExecuteSqlRaw|FromSqlRaw|ExecuteSqlCommand)\s*\('
+EF_MODEL_PATTERN = re.compile(r'public\s+class\s+(\w+)\s*:\s*(?:DbContext|IdentityDbContext|BaseEntity)', re.IGNORECASE)
+EF_DBCONTEXT_PATTERN = re.compile(r'public\s+class\s+(\w+)\s*:\s*DbContext', re.IGNORECASE)
+EF_DBSET_PATTERN = re.compile(r'public\s+(?:DbSet|IDbSet)<(\w+)>\s+(\w+)\s*{\s*get;\s*set;\s*}', re.IGNORECASE)
+EF_CONNECTION_PATTERN = re.compile(r'(?i)(?:connectionstring|connection_string)\s*[=:]\s*["\']([^"\']*(?:Data Source|Server|Database)[^"\']*)["\']')
+EF_MIGRATION_PATTERN = re.compile(r'(?:Add-Migration|Update-Database|migrationBuilder\.CreateTable)')
+EF_RAW_SQL_PATTERN = re.compile(r'(?:ExecuteSqlRaw|FromSqlRaw|ExecuteSqlCommand)\s*\(')
 
+# Upper-cased byte literals at least one of the patterns above needs to match
+CSHARP_KEYWORDS = (b"DBCONTEXT", b"BASEENTITY", b"DBSET", b"CONNECTION", b"SQL")
 
 def detect_csharp_db_patterns(content: str, file_path: Path) -> List[Dict[str, Any]]:
     """Detect C# database patterns including Entity Framework."""
     findings = []
+    line_starts = build_line_index(content)
 
     # Entity Framework DbContext detection
-    for match in re.finditer(EF_DBCONTEXT_PATTERN, content, re.IGNORECASE):
+    for match in EF_DBCONTEXT_PATTERN.finditer(content):
         class_name = match.group(1)
         findings.append({
             "type": "orm_model",
             "framework": "entity_framework",
             "model_name": class_name,
             "file": str(file_path),
-            "line": content[:match.start()].count('\n') + 1,
+            "line": line_number(line_starts, match.start()),
             "evidence": [f"public class {class_name} : DbContext"],
             "confidence": 0.95,
         })
 
     # Entity Framework model classes
-    for match in re.finditer(EF_MODEL_PATTERN, content, re.IGNORECASE):
+    for match in EF_MODEL_PATTERN.finditer(content):
         class_name = match.group(1)
         findings.append({
             "type": "orm_model",
             "framework": "entity_framework",
             "model_name": class_name,
             "file": str(file_path),
-            "line": content[:match.start()].count('\n') + 1,
+            "line": line_number(line_starts, match.start()),
             "evidence": [f"public class {class_name} : BaseEntity"],
             "confidence": 0.9,
         })
 
     # DbSet properties
-    for match in re.finditer(EF_DBSET_PATTERN, content, re.IGNORECASE):
+    for match in EF_DBSET_PATTERN.finditer(content):
         entity_type = match.group(1)
         property_name = match.group(2)
         findings.append({
@@ -54,30 +59,30 @@ def detect_csharp_db_patterns(content: str, file_path: Path) -> List[Dict[str, A
             "framework": "entity_framework",
             "model_name": entity_type,
             "file": str(file_path),
-            "line": content[:match.start()].count('\n') + 1,
+            "line": line_number(line_starts, match.start()),
             "evidence": [f"public DbSet<{entity_type}> {property_name}"],
             "confidence": 0.9,
         })
 
     # Connection strings
-    for match in re.finditer(EF_CONNECTION_PATTERN, content):
+    for match in EF_CONNECTION_PATTERN.finditer(content):
         connection_string = match.group(1)
         findings.append({
             "type": "connection",
             "provider": "sql_server",  # Most common for .NET
             "file": str(file_path),
-            "line": content[:match.start()].count('\n') + 1,
+            "line": line_number(line_starts, match.start()),
             "evidence": [connection_string],
             "confidence": 0.85,
         })
 
     # Raw SQL usage
-    for match in re.finditer(EF_RAW_SQL_PATTERN, content):
+    for match in EF_RAW_SQL_PATTERN.finditer(content):
         findings.append({
             "type": "raw_sql",
             "sql_type": "RAW_SQL",
             "file": str(file_path),
-            "line": content[:match.start()].count('\n') + 1,
+            "line": line_number(line_starts, match.start()),
             "evidence": [match.group(0)],
             "confidence": 0.8,
         })
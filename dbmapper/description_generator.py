@@ -255,8 +255,11 @@ class DescriptionGenerator:
             return "This finding requires security review to ensure compliance with data protection and security standards."
 
 
+# Shared instance; the templates are only read, so one generator serves every finding
+_generator = DescriptionGenerator()
+
+
 # Convenience function
 def generate_finding_description(finding: Dict[str, Any]) -> str:
     """Generate a natural language description for a finding."""
-    generator = DescriptionGenerator()
-    return generator.generate_description(finding)
+    return _generator.generate_description(finding)
@@ -1,133 +1,350 @@
 #!/usr/bin/env python3
 """Detector modules for identifying database-related artifacts."""
 
+import mmap
+import multiprocessing
 import re
+import threading
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple, Union
 import signal
 import sys
 
-from .secret_detector import detect_secrets
-from .migration_detector import detect_migrations, detect_schema_changes
+try:
+    import hyperscan
+except ImportError:  # Optional accelerator; the re scans below are used without it
+    hyperscan = None  # type: ignore[assignment]
+
+from .secret_detector import detect_secrets, SECRET_KEYWORDS
+from .migration_detector import detect_migrations, detect_schema_changes, identify_migration_framework, SCHEMA_KEYWORDS
 from .ast_parser import detect_with_ast
-from .csharp_detector import detect_csharp_db_patterns
-from .php_detector import detect_php_db_patterns
+from .csharp_detector import detect_csharp_db_patterns, CSHARP_KEYWORDS
+from .php_detector import detect_php_db_patterns, PHP_KEYWORDS
 from .description_generator import generate_finding_description
+from .line_index import build_line_index, line_number
 import concurrent.futures
 
 
-# Pre-compiled regex patterns for performance
-DSN_PATTERN = re.compile(r'(?i)(postgres(?:ql)?|mysql|mariadb|mongodb|sqlite|mssql)://[\\w:@\\-\\.\\/\\%\\?\\=~\\&]+')
-ENV_VAR_PATTERN = re.compile(r'(?m)^(DB_URL|DATABASE_URL|[A-Z_]*DB[A-Z_]*)[\\s]*=[\\s]*(.+)')
-ORM_MODEL_PATTERN = re.compile(r'class\\s+(\\w+)\\s*\\([^)]*models\\.Model[^)]*\\)')
-SQL_PATTERN = re.compile(r'(?is)(SELECT|INSERT|UPDATE|DELETE|CREATE\\s+TABLE|ALTER\\s+TABLE)\\s+.+')
+# Pre-compiled regex patterns for performance; files are scanned as raw bytes
+DSN_PATTERN = re.compile(rb'(?i)(postgres(?:ql)?|mysql|mariadb|mongodb|sqlite|mssql)://[\w:@\-./%?=~&]+')
+# The variable name is written as a lookahead for "DB" plus one run of [A-Z_]: it is followed
+# by '=', so it is always the whole run, and '[A-Z_]*DB[A-Z_]*' backtracks quadratically on it
+# Files are scanned without newline translation, so the name may also follow a bare '\r'
+# and the value stops at any line ending
+ENV_VAR_PATTERN = re.compile(rb'(?<![^\r\n])(DB_URL|DATABASE_URL|(?=[A-Z_]*DB)[A-Z_]+)\s*=\s*([^\r\n]+)')
+# The base list is checked for models.Model by a lookahead and then consumed atomically
+# (a captured lookahead plus backreference), and it stops at the next class statement;
+# '[^)]*models\.Model[^)]*' ran to the end of the file from every unclosed 'class x('
+ORM_MODEL_PATTERN = re.compile(
+    rb'class\s+(\w+)\s*\((?=(?:(?!class\s)[^)])*?models\.Model)(?=((?:(?!class\s)[^)])*))\2\)'
+)
+SQL_PATTERN = re.compile(rb'(?is)(SELECT|INSERT|UPDATE|DELETE|CREATE\s+TABLE|ALTER\s+TABLE)\s+.+')
 
-def process_single_file(file_path: Path) -> List[Dict[str, Any]]:
-    """Process a single file for database artifacts."""
-    findings = []
+# Upper-cased byte literals SQL_PATTERN cannot match without
+SQL_KEYWORDS = (b"SELECT", b"INSERT", b"UPDATE", b"DELETE", b"CREATE", b"ALTER")
+
+# Files SQL_PATTERN is not run on: configuration files and migrations that might contain SQL as data
+CONFIG_EXTS = frozenset({'.yaml', '.yml', '.json', '.xml', '.ini', '.cfg', '.conf', '.env', '.toml', '.properties'})
+MIGRATION_RE = re.compile(r'migration|flyway|alembic|prisma', re.IGNORECASE)
+
+# Literals the Python AST visitors need to report anything: SQL keywords in string
+# constants (upper-cased, as they are compared case-insensitively), and the
+# case-sensitive model base names and connection string scheme separator
+AST_SQL_KEYWORDS = SQL_KEYWORDS + (b"DROP",)
+AST_TRIGGERS = (b"Model", b"://")
+
+# Named-group alternation of the DSN, env var and ORM patterns so a file is scanned once
+MASTER_PATTERN = re.compile(
+    rb'(?P<dsn>(?i:(?P<dsn_provider>postgres(?:ql)?|mysql|mariadb|mongodb|sqlite|mssql)://[\w:@\-./%?=~&]+))'
+    rb'|(?P<env>(?<![^\r\n])(?P<env_name>DB_URL|DATABASE_URL|(?=[A-Z_]*DB)[A-Z_]+)\s*=\s*(?P<env_value>[^\r\n]+))'
+    rb'|(?P<orm>class\s+(?P<orm_name>\w+)\s*\((?=(?:(?!class\s)[^)])*?models\.Model)'
+    rb'(?=(?P<orm_bases>(?:(?!class\s)[^)])*))(?P=orm_bases)\))',
+)
+
+# Leading part of each MASTER_PATTERN branch and of SQL_PATTERN. Every match of the
+# full patterns starts where one of these matches, so hyperscan can locate them
+# in one pass and re only has to confirm and extract groups at those offsets.
+# Each prefix is kept short enough that a match end has a single possible start,
+# since hyperscan only reports the leftmost start per end offset. The env var prefix
+# is unanchored (hyperscan has no lookbehind); its leftmost start is the start of
+# the name, which the full pattern then checks follows a line ending.
+CANDIDATE_EXPRESSIONS = (
+    rb'(?:postgres(?:ql)?|mysql|mariadb|mongodb|sqlite|mssql)://[\w:@\-./%?=~&]',
+    rb'(?:DB_URL|DATABASE_URL|[A-Z_]*DB[A-Z_]*)\s*=\s*.',
+    rb'class\s+\w+\s*\(',
+    rb'(?:SELECT|INSERT|UPDATE|DELETE|CREATE\s+TABLE|ALTER\s+TABLE)\s+[\s\S]',
+)
+SQL_CANDIDATE_ID = 3
+
+
+def _compile_candidate_database() -> Any:
+    """Compile CANDIDATE_EXPRESSIONS into a hyperscan database, or None without hyperscan."""
+    if hyperscan is None:
+        return None
+    som = hyperscan.HS_FLAG_SOM_LEFTMOST
+    database = hyperscan.Database()
+    database.compile(
+        expressions=list(CANDIDATE_EXPRESSIONS),
+        ids=list(range(len(CANDIDATE_EXPRESSIONS))),
+        elements=len(CANDIDATE_EXPRESSIONS),
+        flags=[som | hyperscan.HS_FLAG_CASELESS, som, som, som | hyperscan.HS_FLAG_CASELESS],
+    )
+    return database
+
+
+CANDIDATE_DATABASE = _compile_candidate_database()
+
+# Hyperscan scratch space cannot be shared between concurrent scans
+_scratch_local = threading.local()
+
+# Files at least this large are memory-mapped rather than read into the heap
+MMAP_MIN_SIZE = 64 * 1024
+
+# Mapped files are upper-cased for the keyword checks one window at a time;
+# the overlap keeps keywords that straddle a window boundary visible
+KEYWORD_WINDOW_SIZE = 1024 * 1024
+KEYWORD_WINDOW_OVERLAP = 64
+
+
+def _decode(raw: Union[bytes, mmap.mmap]) -> str:
+    """Decode file bytes the same way the text-based detectors read them."""
+    return str(raw, 'utf-8', errors='ignore')
+
+
+def _normalize_newlines(text: str) -> str:
+    """Turn CRLF and bare CR line endings into LF, as reading the file in text mode does."""
+    return text.replace('\r\n', '\n').replace('\r', '\n')
+
+
+def _find_candidates(data: Union[bytes, mmap.mmap]) -> Tuple[List[int], List[int]]:
+    """Return the sorted offsets where MASTER_PATTERN and SQL_PATTERN matches can start."""
+    scratch = getattr(_scratch_local, 'scratch', None)
+    if scratch is None:
+        scratch = _scratch_local.scratch = hyperscan.Scratch(CANDIDATE_DATABASE)
+    master_starts = set()
+    sql_starts = set()
+
+    def on_match(expression_id: int, start: int, end: int, flags: int, context: Any) -> None:
+        if expression_id == SQL_CANDIDATE_ID:
+            sql_starts.add(start)
+        else:
+            master_starts.add(start)
+
+    CANDIDATE_DATABASE.scan(data, match_event_handler=on_match, scratch=scratch)
+    return sorted(master_starts), sorted(sql_starts)
+
+
+def _master_matches(data: Union[bytes, mmap.mmap], candidates: Optional[List[int]]) -> Iterator["re.Match[bytes]"]:
+    """Yield the MASTER_PATTERN.finditer() matches, trying only the candidate offsets when known."""
+    if candidates is None:
+        yield from MASTER_PATTERN.finditer(data)
+        return
+    pos = 0
+    for start in candidates:
+        if start < pos:
+            continue
+        match = MASTER_PATTERN.match(data, start)
+        if match:
+            yield match
+            pos = match.end()
+
+
+def _first_sql_match(data: Union[bytes, mmap.mmap], candidates: Optional[List[int]]) -> Optional["re.Match[bytes]"]:
+    """Return SQL_PATTERN.search(), starting from the first candidate offset when known."""
+    if candidates is None:
+        return SQL_PATTERN.search(data)
+    if not candidates:
+        return None
+    return SQL_PATTERN.match(data, candidates[0])
+
+
+def _keyword_groups_present(data: Union[bytes, mmap.mmap], keyword_groups: List[Tuple[bytes, ...]]) -> List[bool]:
+    """Report, per group of upper-cased keywords, whether any of them occurs in the data."""
+    present = [False] * len(keyword_groups)
+    windows: Iterable[bytes]
+    if isinstance(data, bytes):
+        windows = [data.upper()]
+    else:
+        step = KEYWORD_WINDOW_SIZE - KEYWORD_WINDOW_OVERLAP
+        windows = (data[start:start + KEYWORD_WINDOW_SIZE].upper() for start in range(0, len(data), step))
+    for window in windows:
+        for i, keywords in enumerate(keyword_groups):
+            if not present[i] and any(keyword in window for keyword in keywords):
+                present[i] = True
+        if all(present):
+            break
+    return present
+
+
+def _dsn_finding(provider: bytes, dsn: bytes, line: int, file_str: str) -> Dict[str, Any]:
+    """Build a connection finding for a DSN found in the content."""
+    provider_name = _decode(provider).lower()
+    if provider_name == 'postgres':
+        provider_name = 'postgresql'
+    return {
+        "type": "connection",
+        "provider": sys.intern(provider_name),
+        "file": file_str,
+        "line": line,
+        "evidence": [_decode(dsn)],
+        "confidence": 0.95,
+    }
 
-    try:
-        # Check file size to avoid loading very large files into memory
-        file_size = file_path.stat().st_size
-        max_file_size = 50 * 1024 * 1024  # 50MB limit
 
-        if file_size > max_file_size:
-            # For very large files, skip processing to avoid memory issues
-            return findings
+def process_single_file(file_entry: Tuple[Path, int]) -> List[Dict[str, Any]]:
+    """Process a single (file path, size) entry from discover_files for database artifacts."""
+    findings: List[Dict[str, Any]] = []
+    file_path, file_size = file_entry
 
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            content = f.read()
-            lines = content.splitlines()
+    # Check file size to avoid loading very large files into memory
+    max_file_size = 50 * 1024 * 1024  # 50MB limit
+    if file_size > max_file_size:
+        # For very large files, skip processing to avoid memory issues
+        return findings
+
+    data: Union[bytes, mmap.mmap]
+    try:
+        with open(file_path, 'rb') as f:
+            if file_size < MMAP_MIN_SIZE:
+                data = f.read()
+            else:
+                # The regex scans below run straight over the page cache
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
     except Exception:
         return findings  # Return empty list for unreadable files
 
-    # AST-based detection for supported languages (only Python)
-    ast_findings = detect_with_ast(content, file_path)
-    findings.extend(ast_findings)
-
-    # Connection detector
-    for match in DSN_PATTERN.finditer(content):
-        provider = match.group(1).lower()
-        if provider == 'postgres':
-            provider = 'postgresql'
-        findings.append({
-            "type": "connection",
-            "provider": provider,
-            "file": str(file_path),
-            "line": content[:match.start()].count('\n') + 1,
-            "evidence": [match.group(0)],
-            "confidence": 0.95,
-        })
-
-    # Env var detector
-    for match in ENV_VAR_PATTERN.finditer(content):
-        var_name = match.group(1)
-        value = match.group(2).strip()
-        if DSN_PATTERN.search(value):
-            provider_match = DSN_PATTERN.search(value)
-            provider = provider_match.group(1).lower()
-            if provider == 'postgres':
-                provider = 'postgresql'
-            findings.append({
-                "type": "connection",
-                "provider": provider,
-                "file": str(file_path),
-                "line": content[:match.start()].count('\n') + 1,
-                "evidence": [f"{var_name}={value}"],
-                "confidence": 0.9,
-            })
+    if isinstance(data, bytes):
+        return _scan_file_data(data, file_path)
+    with data:
+        return _scan_file_data(data, file_path)
 
-    # ORM model detector (basic Django)
-    if file_path.suffix == '.py':
-        for match in ORM_MODEL_PATTERN.finditer(content):
-            model_name = match.group(1)
-            findings.append({
-                "type": "orm_model",
-                "framework": "django",
-                "file": str(file_path),
-                "line": content[:match.start()].count('\n') + 1,
-                "evidence": [f"class {model_name}(models.Model):"],
-                "confidence": 0.95,
-            })
+
+def _scan_file_data(data: Union[bytes, mmap.mmap], file_path: Path) -> List[Dict[str, Any]]:
+    """Run the detectors over the raw bytes (or memory map) of one file."""
+    findings: List[Dict[str, Any]] = []
+    # One path string shared by every finding of the file, so it is pickled once per batch
+    file_str = sys.intern(str(file_path))
+
+    # Cheap substring checks decide which regex scans can possibly match
+    path_suffix = file_path.suffix
+    suffix = path_suffix.lower()
+    is_python = path_suffix == '.py'
+    scan_connections = data.find(b"://") != -1 or (is_python and data.find(b"models.Model") != -1)
+    keyword_groups = [SQL_KEYWORDS, SCHEMA_KEYWORDS, CSHARP_KEYWORDS, PHP_KEYWORDS, SECRET_KEYWORDS, AST_SQL_KEYWORDS]
+    has_sql, scan_schema, has_csharp, has_php, scan_secrets, has_ast_sql = _keyword_groups_present(data, keyword_groups)
+    # Most Python files have no database code, so skip parsing them into an AST
+    scan_ast = is_python and (has_ast_sql or any(data.find(trigger) != -1 for trigger in AST_TRIGGERS))
 
     # Raw SQL detector - skip config files and migration files that might contain SQL as data
-    config_extensions = {'.yaml', '.yml', '.json', '.xml', '.ini', '.cfg', '.conf', '.env', '.toml', '.properties'}
-    migration_indicators = ['migration', 'migrations', 'flyway', 'alembic', 'prisma']
-    is_migration_file = any(indicator in str(file_path).lower() for indicator in migration_indicators)
+    scan_sql = has_sql and suffix not in CONFIG_EXTS and not MIGRATION_RE.search(file_str)
+
+    scan_migrations = identify_migration_framework(file_path) is not None
+    scan_csharp = suffix in ('.cs', '.vb') and has_csharp
+    scan_php = suffix == '.php' and has_php
+
+    # Only the text-based detectors need the decoded content
+    content = ""
+    if scan_ast or scan_migrations or scan_schema or scan_csharp or scan_php or scan_secrets:
+        content = _decode(data)
+
+    # AST-based detection for supported languages (only Python)
+    if scan_ast:
+        ast_findings = detect_with_ast(content, file_path)
+        findings.extend(ast_findings)
+
+    # Offsets of each line start, so matches map to line numbers by bisection
+    line_starts: List[int] = []
+    if scan_connections or scan_sql:
+        line_starts = build_line_index(data)
+
+    # With hyperscan, one pass finds where the connection/env/ORM and SQL matches can start
+    master_starts: Optional[List[int]] = None
+    sql_starts: Optional[List[int]] = None
+    if CANDIDATE_DATABASE is not None and (scan_connections or scan_sql):
+        master_starts, sql_starts = _find_candidates(data)
+
+    # Connection, env var and ORM detectors share a single pass over the content
+    if scan_connections:
+        for match in _master_matches(data, master_starts):
+            kind = match.lastgroup
+            if kind == "dsn":
+                line = line_number(line_starts, match.start())
+                findings.append(_dsn_finding(match.group("dsn_provider"), match.group(0), line, file_str))
+            elif kind == "env":
+                # DSNs embedded in the assignment are reported on their own as well
+                for dsn_match in DSN_PATTERN.finditer(data, match.start(), match.end()):
+                    line = line_number(line_starts, dsn_match.start())
+                    findings.append(_dsn_finding(dsn_match.group(1), dsn_match.group(0), line, file_str))
+                var_name = _decode(match.group("env_name"))
+                value = match.group("env_value").strip()
+                provider_match = DSN_PATTERN.search(value)
+                if provider_match:
+                    provider = _decode(provider_match.group(1)).lower()
+                    if provider == 'postgres':
+                        provider = 'postgresql'
+                    findings.append({
+                        "type": "connection",
+                        "provider": sys.intern(provider),
+                        "file": file_str,
+                        "line": line_number(line_starts, match.start()),
+                        "evidence": [f"{var_name}={_decode(value)}"],
+                        "confidence": 0.9,
+                    })
+            elif kind == "orm" and is_python:
+                # ORM model detector (basic Django)
+                model_name = _decode(match.group("orm_name"))
+                findings.append({
+                    "type": "orm_model",
+                    "framework": "django",
+                    "file": file_str,
+                    "line": line_number(line_starts, match.start()),
+                    "evidence": [f"class {model_name}(models.Model):"],
+                    "confidence": 0.95,
+                })
 
-    if file_path.suffix.lower() not in config_extensions and not is_migration_file:
-        for match in SQL_PATTERN.finditer(content):
-            sql_type = match.group(1).upper()
+    # Raw SQL detector
+    if scan_sql:
+        # The trailing DOTALL '.+' runs to the end of the content, so there is at most one match
+        sql_match = _first_sql_match(data, sql_starts)
+        if sql_match:
+            sql_type = _decode(sql_match.group(1)).upper()
             findings.append({
                 "type": "raw_sql",
-                "sql_type": sql_type,
-                "file": str(file_path),
-                "line": content[:match.start()].count('\n') + 1,
-                "evidence": [match.group(0)],
+                "sql_type": sys.intern(sql_type),
+                "file": file_str,
+                "line": line_number(line_starts, sql_match.start()),
+                "evidence": [_normalize_newlines(_decode(sql_match.group(0)))],
                 "confidence": 0.8,
             })
 
     # Migration detection
-    migration_findings = detect_migrations(content, file_path)
-    findings.extend(migration_findings)
+    if scan_migrations:
+        migration_findings = detect_migrations(content, file_path)
+        findings.extend(migration_findings)
 
     # Schema change detection
-    schema_findings = detect_schema_changes(content, file_path)
-    findings.extend(schema_findings)
+    if scan_schema:
+        schema_findings = detect_schema_changes(content, file_path)
+        findings.extend(schema_findings)
 
     # C# detection
-    if file_path.suffix.lower() in ['.cs', '.vb']:
+    if scan_csharp:
         csharp_findings = detect_csharp_db_patterns(content, file_path)
         findings.extend(csharp_findings)
 
     # PHP detection
-    if file_path.suffix.lower() in ['.php']:
+    if scan_php:
         php_findings = detect_php_db_patterns(content, file_path)
         findings.extend(php_findings)
 
-    # Secret detection (run on all files)
-    secret_findings = detect_secrets(content, file_path)
-    findings.extend(secret_findings)
+    # Secret detection (only files containing one of SECRET_KEYWORDS)
+    if scan_secrets:
+        secret_findings = detect_secrets(content, file_path)
+        findings.extend(secret_findings)
+
+    # Findings from the other detector modules carry their own copy of the path
+    for finding in findings:
+        finding["file"] = file_str
 
     # Skip description generation for now - will be done in batch later
     # This avoids ThreadPoolExecutor overhead per file
@@ -135,12 +352,42 @@ def process_single_file(file_path: Path) -> List[Dict[str, Any]]:
     return findings
 
 
-def run_detectors(files: List[Path], threads: int = 8) -> List[Dict[str, Any]]:
+def _pool_context() -> Any:
+    """Return the multiprocessing context the detector pool is started with.
+
+    Forked workers inherit the already-imported detector modules and compiled
+    patterns; platforms without a safe fork start workers with spawn.
+    """
+    if sys.platform.startswith('linux'):
+        return multiprocessing.get_context('fork')
+    return multiprocessing.get_context('spawn')
+
+
+def _warm_worker() -> None:
+    """Pool initializer: set up per-worker scan state before the first file arrives.
+
+    The detector modules and their compiled patterns are already loaded here, either
+    inherited through fork or imported under spawn to unpickle this function; only
+    the hyperscan scratch space is otherwise allocated lazily on the first scan.
+    """
+    if CANDIDATE_DATABASE is not None:
+        _scratch_local.scratch = hyperscan.Scratch(CANDIDATE_DATABASE)
+
+
+def _pool_chunksize(num_files: int, max_workers: int) -> int:
+    """Number of files sent to a worker per round trip."""
+    return max(1, num_files // (max_workers * 8))
+
+
+def run_detectors(files: List[Tuple[Path, int]], threads: int = 8, include_descriptions: bool = True,
+                  min_confidence: float = 0.0) -> List[Dict[str, Any]]:
     """Run all enabled detectors on the discovered files.
 
     Args:
-        files: List of file paths to scan
+        files: List of (file path, size) tuples to scan, as returned by discover_files
         threads: Number of threads to use
+        include_descriptions: Whether to generate finding descriptions; when False they are left empty
+        min_confidence: Findings below this confidence are filtered out later, so get no description
 
     Returns:
         List of findings
@@ -152,8 +399,8 @@ def run_detectors(files: List[Path], threads: int = 8) -> List[Dict[str, Any]]:
 
     # For small number of files, sequential processing is faster due to process overhead
     if num_files <= 10:
-        for file_path in files:
-            file_findings = process_single_file(file_path)
+        for file_entry in files:
+            file_findings = process_single_file(file_entry)
             findings.extend(file_findings)
     elif threads > 1:
         # Adaptive executor selection based on workload size
@@ -161,43 +408,46 @@ def run_detectors(files: List[Path], threads: int = 8) -> List[Dict[str, Any]]:
             # Small-medium workloads: use ThreadPoolExecutor
             max_workers = min(threads, 16)
             with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-                future_to_file = {executor.submit(process_single_file, file_path): file_path for file_path in files}
+                future_to_file = {executor.submit(process_single_file, file_entry): file_entry for file_entry in files}
                 for future in concurrent.futures.as_completed(future_to_file):
                     file_findings = future.result()
                     findings.extend(file_findings)
         elif num_files <= 500:
-            # Medium-large workloads: use ProcessPoolExecutor with moderate parallelism
-            max_workers = min(threads * 2, 48, 61)  # ProcessPoolExecutor limit
-            with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
-                future_to_file = {executor.submit(process_single_file, file_path): file_path for file_path in files}
-                for future in concurrent.futures.as_completed(future_to_file):
-                    file_findings = future.result()
+            # Medium-large workloads: use a process pool with moderate parallelism.
+            # Findings come back as plain dicts: pickle already memoizes the repeated
+            # key strings, and packing them into tuples measured slower overall once
+            # the main process rebuilds the dicts.
+            max_workers = min(threads * 2, 48, 61)  # Windows process pool limit
+            with _pool_context().Pool(max_workers, initializer=_warm_worker) as pool:
+                for file_findings in pool.imap_unordered(process_single_file, files, _pool_chunksize(num_files, max_workers)):
                     findings.extend(file_findings)
         else:
-            # Very large workloads: use ProcessPoolExecutor with high parallelism
-            max_workers = min(threads * 4, 128, 61)  # ProcessPoolExecutor limit
-            with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
-                future_to_file = {executor.submit(process_single_file, file_path): file_path for file_path in files}
-                for future in concurrent.futures.as_completed(future_to_file):
-                    file_findings = future.result()
+            # Very large workloads: use a process pool with high parallelism
+            max_workers = min(threads * 4, 128, 61)  # Windows process pool limit
+            with _pool_context().Pool(max_workers, initializer=_warm_worker) as pool:
+                for file_findings in pool.imap_unordered(process_single_file, files, _pool_chunksize(num_files, max_workers)):
                     findings.extend(file_findings)
     else:
         # Sequential processing
-        for file_path in files:
-            file_findings = process_single_file(file_path)
+        for file_entry in files:
+            file_findings = process_single_file(file_entry)
             findings.extend(file_findings)
 
     # Assign IDs to all findings
     for i, finding in enumerate(findings, 1):
         finding["id"] = f"f-{i:04d}"
 
-    # Generate descriptions in batch to avoid per-file ThreadPoolExecutor overhead
-    if findings:
+    # Generate descriptions in batch; they are local templating bound by the GIL,
+    # so a plain loop is faster than handing each finding to a thread pool
+    if include_descriptions and findings:
         print(f"Generating descriptions for {len(findings)} findings...")
-        with concurrent.futures.ThreadPoolExecutor(max_workers=min(len(findings), 32)) as desc_executor:
-            desc_futures = {desc_executor.submit(generate_finding_description, finding): finding for finding in findings}
-            for future in concurrent.futures.as_completed(desc_futures):
-                finding = desc_futures[future]
-                finding["description"] = future.result()
+        for finding in findings:
+            if finding.get("confidence", 0) >= min_confidence:
+                finding["description"] = generate_finding_description(finding)
+            else:
+                finding["description"] = ""
+    else:
+        for finding in findings:
+            finding["description"] = ""
 
     return findings
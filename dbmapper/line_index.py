@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""Offset-to-line-number lookup shared by the regex detectors."""
+
+import mmap
+import re
+from bisect import bisect_right
+from typing import List, Union
+
+
+# Files are scanned without newline translation, so '\r\n' and a bare '\r' end a line
+# as well, numbering lines the way reading the file in text mode did
+NEWLINE_PATTERN = re.compile(r'\r\n|\r|\n')
+NEWLINE_BYTES_PATTERN = re.compile(rb'\r\n|\r|\n')
+
+# Every boundary str.splitlines() breaks on, so offsets map to the same line numbers
+SPLITLINES_PATTERN = re.compile('\r\n|[\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]')
+
+
+def build_line_index(content: Union[str, bytes, mmap.mmap]) -> List[int]:
+    """Return the offset at which each line of the content starts."""
+    line_starts = [0]
+    if isinstance(content, str):
+        line_starts.extend(match.end() for match in NEWLINE_PATTERN.finditer(content))
+    else:
+        line_starts.extend(match.end() for match in NEWLINE_BYTES_PATTERN.finditer(content))
+    return line_starts
+
+
+def line_number(line_starts: List[int], offset: int) -> int:
+    """Return the 1-based line number containing the given offset."""
+    return bisect_right(line_starts, offset)
+
+
+def matching_line_numbers(content: str, pattern: "re.Pattern[str]") -> List[int]:
+    """Return the sorted 1-based numbers of the content.splitlines() lines the pattern matches in.
+
+    Lets line-oriented detectors scan the whole content once with a cheap literal
+    pattern and only run their full pattern set on the lines it hits.
+    """
+    line_starts = [0]
+    line_starts.extend(match.end() for match in SPLITLINES_PATTERN.finditer(content))
+    return sorted({bisect_right(line_starts, match.start()) for match in pattern.finditer(content)})
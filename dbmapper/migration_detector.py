@@ -3,82 +3,111 @@
 
 import re
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
+from .line_index import matching_line_numbers
+
+
+# Content patterns only tested for a match on a line. Just the first UPDATE (or migrate
+# definition) on a line needs trying: if no SET (or parenthesis) follows it, none follows
+# a later one. The tempered prefix stops there, where 'UPDATE\s+.*SET' would retry every
+# occurrence and backtrack quadratically on long lines.
+UPDATE_SET_PATTERN = re.compile(r'^(?:(?!UPDATE\s).)*UPDATE\s.*SET', re.IGNORECASE)
+MIGRATE_FUNCTION_PATTERN = re.compile(r'^(?:(?!def\s+migrate).)*def\s+migrate.*\(', re.IGNORECASE)
 
 # Migration file patterns by framework
 MIGRATION_PATTERNS = {
 "prisma": {
 "file_patterns": [r"prisma/migrations/.*\.sql$", r"packages/prisma/migrations/.*\.sql$", r"migrations/.*\.sql$"],
 "content_patterns": [
-(r'CREATE\s+TABLE', "create_table", 0.9),
-(r'ALTER\s+TABLE', "alter_table", 0.9),
-(r'DROP\s+TABLE', "drop_table", 0.9),
-(r'INSERT\s+INTO', "insert_data", 0.8),
-(r'UPDATE\s+.*SET', "update_data", 0.8),
-(r'DELETE\s+FROM', "delete_data", 0.8),
+(re.compile(r'CREATE\s+TABLE', re.IGNORECASE), "create_table", 0.9),
+(re.compile(r'ALTER\s+TABLE', re.IGNORECASE), "alter_table", 0.9),
+(re.compile(r'DROP\s+TABLE', re.IGNORECASE), "drop_table", 0.9),
+(re.compile(r'INSERT\s+INTO', re.IGNORECASE), "insert_data", 0.8),
+(UPDATE_SET_PATTERN, "update_data", 0.8),
+(re.compile(r'DELETE\s+FROM', re.IGNORECASE), "delete_data", 0.8),
 ]
 },
 "django": {
         "file_patterns": [r"migrations/.*\.py$", r".*migrate.*\.py$"],
         "content_patterns": [
-            (r'def\s+migrate.*?\(', "migration_function", 0.9),
-            (r'operations\s*=\s*\[', "django_operations", 0.95),
-            (r'CreateModel\s*\(', "create_model", 0.9),
-            (r'DeleteModel\s*\(', "delete_model", 0.9),
-            (r'AddField\s*\(', "add_field", 0.9),
-            (r'RemoveField\s*\(', "remove_field", 0.9),
-            (r'RunSQL\s*\(', "run_sql", 0.8),
+            (MIGRATE_FUNCTION_PATTERN, "migration_function", 0.9),
+            (re.compile(r'operations\s*=\s*\[', re.IGNORECASE), "django_operations", 0.95),
+            (re.compile(r'CreateModel\s*\(', re.IGNORECASE), "create_model", 0.9),
+            (re.compile(r'DeleteModel\s*\(', re.IGNORECASE), "delete_model", 0.9),
+            (re.compile(r'AddField\s*\(', re.IGNORECASE), "add_field", 0.9),
+            (re.compile(r'RemoveField\s*\(', re.IGNORECASE), "remove_field", 0.9),
+            (re.compile(r'RunSQL\s*\(', re.IGNORECASE), "run_sql", 0.8),
         ]
     },
     "alembic": {
         "file_patterns": [r"versions/.*\.py$", r".*alembic.*\.py$"],
         "content_patterns": [
-            (r'def\s+upgrade\(\):', "alembic_upgrade", 0.95),
-            (r'def\s+downgrade\(\):', "alembic_downgrade", 0.95),
-            (r'op\.create_table', "create_table", 0.9),
-            (r'op\.drop_table', "drop_table", 0.9),
-            (r'op\.add_column', "add_column", 0.9),
-            (r'op\.drop_column', "drop_column", 0.9),
+            (re.compile(r'def\s+upgrade\(\):', re.IGNORECASE), "alembic_upgrade", 0.95),
+            (re.compile(r'def\s+downgrade\(\):', re.IGNORECASE), "alembic_downgrade", 0.95),
+            (re.compile(r'op\.create_table', re.IGNORECASE), "create_table", 0.9),
+            (re.compile(r'op\.drop_table', re.IGNORECASE), "drop_table", 0.9),
+            (re.compile(r'op\.add_column', re.IGNORECASE), "add_column", 0.9),
+            (re.compile(r'op\.drop_column', re.IGNORECASE), "drop_column", 0.9),
         ]
     },
     "flyway": {
         "file_patterns": [r"db/migration/.*\.sql$", r"V.*__.*\.sql$"],
         "content_patterns": [
-            (r'CREATE\s+TABLE', "create_table", 0.9),
-            (r'ALTER\s+TABLE', "alter_table", 0.9),
-            (r'DROP\s+TABLE', "drop_table", 0.9),
-            (r'INSERT\s+INTO', "insert_data", 0.7),
-            (r'UPDATE\s+.*SET', "update_data", 0.7),
+            (re.compile(r'CREATE\s+TABLE', re.IGNORECASE), "create_table", 0.9),
+            (re.compile(r'ALTER\s+TABLE', re.IGNORECASE), "alter_table", 0.9),
+            (re.compile(r'DROP\s+TABLE', re.IGNORECASE), "drop_table", 0.9),
+            (re.compile(r'INSERT\s+INTO', re.IGNORECASE), "insert_data", 0.7),
+            (UPDATE_SET_PATTERN, "update_data", 0.7),
         ]
     },
     "liquibase": {
         "file_patterns": [r".*\.xml$", r".*\.yaml$", r".*\.yml$", r".*\.json$"],
         "content_patterns": [
-            (r'<createTable', "create_table", 0.9),
-            (r'<dropTable', "drop_table", 0.9),
-            (r'<addColumn', "add_column", 0.9),
-            (r'<sql>', "raw_sql", 0.8),
+            (re.compile(r'<createTable', re.IGNORECASE), "create_table", 0.9),
+            (re.compile(r'<dropTable', re.IGNORECASE), "drop_table", 0.9),
+            (re.compile(r'<addColumn', re.IGNORECASE), "add_column", 0.9),
+            (re.compile(r'<sql>', re.IGNORECASE), "raw_sql", 0.8),
         ]
     },
     "rails": {
         "file_patterns": [r"db/migrate/.*\.rb$", r".*migration.*\.rb$"],
         "content_patterns": [
-            (r'def\s+change', "rails_change", 0.95),
-            (r'def\s+up', "rails_up", 0.9),
-            (r'def\s+down', "rails_down", 0.9),
-            (r'create_table', "create_table", 0.9),
-            (r'drop_table', "drop_table", 0.9),
-            (r'add_column', "add_column", 0.9),
+            (re.compile(r'def\s+change', re.IGNORECASE), "rails_change", 0.95),
+            (re.compile(r'def\s+up', re.IGNORECASE), "rails_up", 0.9),
+            (re.compile(r'def\s+down', re.IGNORECASE), "rails_down", 0.9),
+            (re.compile(r'create_table', re.IGNORECASE), "create_table", 0.9),
+            (re.compile(r'drop_table', re.IGNORECASE), "drop_table", 0.9),
+            (re.compile(r'add_column', re.IGNORECASE), "add_column", 0.9),
         ]
     }
 }
 
+# Migration file name conventions
+# Lookahead for the .sql suffix, then a lazy scan for the timestamp; '.*\d{14}.*\.sql$'
+# backtracks cubically on long runs of digits
+TIMESTAMPED_SQL_PATTERN = re.compile(r'(?=.*\.sql$).*?\d{14}')
+FLYWAY_FILE_PATTERN = re.compile(r'V.*__.*\.sql$')
+
+# DDL statements reported as schema changes
+SCHEMA_PATTERNS = [
+    (re.compile(r'CREATE\s+TABLE\s+(\w+)', re.IGNORECASE), "create_table", "table_creation"),
+    (re.compile(r'ALTER\s+TABLE\s+(\w+)', re.IGNORECASE), "alter_table", "table_modification"),
+    (re.compile(r'DROP\s+TABLE\s+(\w+)', re.IGNORECASE), "drop_table", "table_deletion"),
+    (re.compile(r'CREATE\s+INDEX\s+(\w+)', re.IGNORECASE), "create_index", "index_creation"),
+    (re.compile(r'ADD\s+CONSTRAINT\s+(\w+)', re.IGNORECASE), "add_constraint", "constraint_addition"),
+]
+
+# Upper-cased byte literals at least one of SCHEMA_PATTERNS needs to match
+SCHEMA_KEYWORDS = (b"TABLE", b"INDEX", b"CONSTRAINT")
+
+# The same literals, used to find candidate lines in a single pass
+SCHEMA_ANCHOR_PATTERN = re.compile(r'TABLE|INDEX|CONSTRAINT', re.IGNORECASE)
 
 def detect_migrations(content: str, file_path: Path) -> List[Dict[str, Any]]:
     """Detect migration-related patterns in files."""
     findings = []
-    framework = _identify_framework(file_path)
+    framework = identify_migration_framework(file_path)
 
     if not framework:
         return findings
@@ -88,7 +117,7 @@ def detect_migrations(content: str, file_path: Path) -> List[Dict[str, Any]]:
 
     for line_num, line in enumerate(lines, 1):
         for pattern, migration_type, confidence in patterns:
-            if re.search(pattern, line, re.IGNORECASE):
+            if pattern.search(line):
                 findings.append({
                     "type": "migration",
                     "framework": framework,
@@ -102,14 +131,14 @@ def detect_migrations(content: str, file_path: Path) -> List[Dict[str, Any]]:
     return findings
 
 
-def _identify_framework(file_path: Path) -> str:
+def identify_migration_framework(file_path: Path) -> Optional[str]:
     """Identify the migration framework based on file path and structure."""
     path_str = str(file_path)
 
     # Prisma (check for SQL migration files in migrations directory)
     if ('migrations' in path_str or 'packages/prisma/migrations' in path_str) and file_path.suffix == '.sql':
         # Additional check for timestamped migration files
-        if re.match(r'.*\d{14}.*\.sql$', str(file_path)) or 'migration' in str(file_path).lower():
+        if TIMESTAMPED_SQL_PATTERN.match(str(file_path)) or 'migration' in str(file_path).lower():
             return "prisma"
 
     # Django
@@ -125,7 +154,7 @@ def _identify_framework(file_path: Path) -> str:
         return "rails"
 
     # Flyway
-    if ('db/migration' in path_str or re.match(r'V.*__.*\.sql$', file_path.name)):
+    if ('db/migration' in path_str or FLYWAY_FILE_PATTERN.match(file_path.name)):
         return "flyway"
 
     # Liquibase (check content for XML/YAML structure)
@@ -140,17 +169,10 @@ def detect_schema_changes(content: str, file_path: Path) -> List[Dict[str, Any]]
     findings = []
     lines = content.splitlines()
 
-    schema_patterns = [
-        (r'CREATE\s+TABLE\s+(\w+)', "create_table", "table_creation"),
-        (r'ALTER\s+TABLE\s+(\w+)', "alter_table", "table_modification"),
-        (r'DROP\s+TABLE\s+(\w+)', "drop_table", "table_deletion"),
-        (r'CREATE\s+INDEX\s+(\w+)', "create_index", "index_creation"),
-        (r'ADD\s+CONSTRAINT\s+(\w+)', "add_constraint", "constraint_addition"),
-    ]
-
-    for line_num, line in enumerate(lines, 1):
-        for pattern, change_type, description in schema_patterns:
-            match = re.search(pattern, line, re.IGNORECASE)
+    for line_num in matching_line_numbers(content, SCHEMA_ANCHOR_PATTERN):
+        line = lines[line_num - 1]
+        for pattern, change_type, description in SCHEMA_PATTERNS:
+            match = pattern.search(line)
             if match:
                 table_name = match.group(1) if match.groups() else "unknown"
                 findings.append({
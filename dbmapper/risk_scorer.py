@@ -8,6 +8,10 @@ import math
 import os
 
 
+# Port number in a connection string or host reference
+PORT_PATTERN = re.compile(r':(\d{4,5})')
+
+
 class RiskScorer:
     """Advanced risk scoring system for database-related findings."""
 
@@ -172,12 +176,11 @@ class RiskScorer:
         evidence = " ".join(finding.get("evidence", [])).lower()
 
         # Check for exposed ports
-        if re.search(r':\d{4,5}', evidence):
-            port = re.search(r':(\d{4,5})', evidence)
-            if port:
-                port_num = int(port.group(1))
-                if port_num < 1024 or port_num in [3306, 5432, 27017, 6379]:  # Common DB ports
-                    multiplier *= self.context_multipliers["exposed_port"]
+        port = PORT_PATTERN.search(evidence)
+        if port:
+            port_num = int(port.group(1))
+            if port_num < 1024 or port_num in [3306, 5432, 27017, 6379]:  # Common DB ports
+                multiplier *= self.context_multipliers["exposed_port"]
 
         # Check for weak authentication
         if "password" in evidence and len(evidence) < 20:
@@ -36,13 +36,15 @@ def run_scan(args) -> None:
 
     # 1. Discover files
     phase_start = time.time()
-    files = discover_files(repo_path, include_patterns, exclude_patterns, languages)
+    files = discover_files(repo_path, include_patterns, exclude_patterns, languages, args.git_files)
     discovery_time = time.time() - phase_start
     print(f"Discovered {len(files)} files to scan ({discovery_time:.2f}s)")
 
     # 2. Run detectors
     phase_start = time.time()
-    findings = run_detectors(files, threads)
+    # Only the JSON, HTML and CSV writers use finding descriptions
+    include_descriptions = any(fmt in formats for fmt in ("json", "html", "csv"))
+    findings = run_detectors(files, threads, include_descriptions, min_confidence)
     detector_time = time.time() - phase_start
     print(f"Found {len(findings)} raw findings ({detector_time:.2f}s)")
 
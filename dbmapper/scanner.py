@@ -3,9 +3,10 @@
 
 import fnmatch
 import os
+import re
 import subprocess
 from pathlib import Path
-from typing import List, Optional
+from typing import Iterator, List, Optional, Set, Tuple
 
 
 # Language detection by file extensions
@@ -59,7 +60,7 @@ def _get_git_files(repo_path: Path) -> List[Path]:
             timeout=60  # Increased timeout for massive repos
         )
         if result.returncode == 0:
-            files = []
+            files: List[Path] = []
             for line in result.stdout.strip().split('\n'):
                 if line.strip():
                     files.append(repo_path / line.strip())
@@ -69,30 +70,56 @@ def _get_git_files(repo_path: Path) -> List[Path]:
     return []
 
 
+def _compile_globs(patterns: List[str]) -> "re.Pattern[str]":
+    """Combine glob patterns into one regex that matches like fnmatch.fnmatch against any of them."""
+    # An empty pattern list matches nothing, as any() over no patterns would
+    return re.compile("|".join(fnmatch.translate(os.path.normcase(pattern)) for pattern in patterns) or "(?!)")
+
+
+def _walk_files(root: str, prune_dirs: Set[str]) -> Iterator["os.DirEntry[str]"]:
+    """Yield every file under root, skipping directories whose name is in prune_dirs."""
+    pending = [root]
+    while pending:
+        directory = pending.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in prune_dirs:
+                            pending.append(entry.path)
+                    elif entry.is_file():
+                        yield entry
+        except OSError:
+            # Unreadable directory
+            continue
+
+
 def discover_files(
     repo_path: Path,
     include_patterns: List[str],
     exclude_patterns: List[str],
     languages: Optional[List[str]] = None,
-) -> List[Path]:
+    use_git: bool = False,
+) -> List[Tuple[Path, int]]:
     """Discover files in the repository matching the criteria.
 
-    Uses git ls-files for faster discovery and automatic .gitignore respect.
+    Walks the tree with os.scandir, pruning excluded directories during descent.
 
     Args:
         repo_path: Root path of the repository
         include_patterns: Glob patterns to include
         exclude_patterns: Glob patterns to exclude
         languages: List of languages to filter by (None for all)
+        use_git: List files with git ls-files instead (tracked files only, respects .gitignore)
 
     Returns:
-        List of matching file paths
+        List of (file path, size in bytes) tuples for the matching files
     """
     if not repo_path.exists() or not repo_path.is_dir():
         raise ValueError(f"Repository path {repo_path} does not exist or is not a directory")
 
     # If no languages specified, include all
-    allowed_extensions = set()
+    allowed_extensions: Set[str] = set()
     if languages:
         for lang in languages:
             if lang in LANGUAGE_EXTENSIONS:
@@ -110,22 +137,10 @@ def discover_files(
     allowed_extensions.update(LANGUAGE_EXTENSIONS["docker"])
     allowed_extensions.update(LANGUAGE_EXTENSIONS["terraform"])
 
-    # Use git ls-files --cached for fastest discovery in git repos (respects .gitignore)
-    all_files = []
-    git_files = _get_git_files(repo_path)
-    if git_files:
-        all_files = git_files
-    else:
-        # Fallback to filesystem traversal if git ls-files fails (non-git repos)
-        for pattern in include_patterns:
-            for path in repo_path.rglob(pattern):
-                if path.is_file():
-                    all_files.append(path)
-
     # Pre-compute exclude extensions and patterns for faster filtering
-    exclude_extensions = set()
-    exclude_path_patterns = []
-    exclude_dir_patterns = []
+    exclude_extensions: Set[str] = set()
+    exclude_path_patterns: List[str] = []
+    exclude_dir_patterns: List[str] = []
 
     for pattern in exclude_patterns:
         if pattern.startswith("**/*.") and pattern.count("*") == 1:
@@ -137,48 +152,63 @@ def discover_files(
         else:
             exclude_path_patterns.append(pattern)
 
+    # Directory names excluded at any depth ("**/name/**") are never descended into;
+    # any other directory pattern is matched as a path glob
+    prune_dirs: Set[str] = set()
+    for dir_pattern in exclude_dir_patterns:
+        if dir_pattern.startswith("**/") and not any(c in dir_pattern[3:] for c in "*?[/"):
+            prune_dirs.add(dir_pattern[3:])
+        else:
+            exclude_path_patterns.append(dir_pattern + "/**")
+
+    # Catches files under excluded directories that discovery did not prune (git ls-files)
+    exclude_dir_regex = None
+    if prune_dirs:
+        dir_names = "|".join(re.escape(os.path.normcase(name)) for name in sorted(prune_dirs))
+        exclude_dir_regex = re.compile(r"(?:^|[\\/])(?:" + dir_names + r")[\\/]")
+
+    # Candidate files, with the directory entry when the walk already has one to stat
+    all_files: List[Tuple[Path, Optional["os.DirEntry[str]"]]]
+    git_files = _get_git_files(repo_path) if use_git else []
+    if git_files:
+        all_files = [(path, None) for path in git_files]
+    else:
+        all_files = [(Path(entry.path), entry) for entry in _walk_files(str(repo_path), prune_dirs)]
+
+    # Glob patterns are matched through one combined regex each instead of per-pattern fnmatch calls
+    exclude_path_regex = _compile_globs(exclude_path_patterns) if exclude_path_patterns else None
+    # Only filter includes if not including everything
+    include_regex = _compile_globs(include_patterns) if include_patterns != ["**/*"] else None
+
     # Filter files with optimized checks
-    files = []
+    files: List[Tuple[Path, int]] = []
     repo_path_str = str(repo_path)
 
-    for path in all_files:
+    for path, entry in all_files:
         path_str = str(path)
 
         # Quick extension check first (fastest)
         if path.suffix in exclude_extensions:
             continue
 
-        # Fast directory exclusion check
-        if exclude_dir_patterns:
-            for dir_pattern in exclude_dir_patterns:
-                if dir_pattern in path_str:
-                    continue
+        # Use string relative path calculation (faster than pathlib.relative_to)
+        if path_str.startswith(repo_path_str):
+            relative_str = path_str[len(repo_path_str):].lstrip(os.sep)
+        else:
+            relative_str = str(path.relative_to(repo_path))
+        relative_str = os.path.normcase(relative_str)
 
-        # Check if file actually exists (git ls-files might include deleted files)
-        if not path.exists():
+        # Fast directory exclusion check
+        if exclude_dir_regex and exclude_dir_regex.search(relative_str):
             continue
 
         # Check exclude path patterns (only for complex patterns)
-        if exclude_path_patterns:
-            # Use string relative path calculation (faster than pathlib.relative_to)
-            if path_str.startswith(repo_path_str):
-                relative_str = path_str[len(repo_path_str):].lstrip(os.sep)
-            else:
-                relative_str = str(path.relative_to(repo_path))
-
-            if any(fnmatch.fnmatch(relative_str, excl) for excl in exclude_path_patterns):
-                continue
+        if exclude_path_regex and exclude_path_regex.match(relative_str):
+            continue
 
         # Check include patterns
-        if include_patterns != ["**/*"]:  # Only filter if not including everything
-            if not relative_str:
-                if path_str.startswith(repo_path_str):
-                    relative_str = path_str[len(repo_path_str):].lstrip(os.sep)
-                else:
-                    relative_str = str(path.relative_to(repo_path))
-
-            if not any(fnmatch.fnmatch(relative_str, incl) for incl in include_patterns):
-                continue
+        if include_regex and not include_regex.match(relative_str):
+            continue
 
         # Check allowed extensions
         if allowed_extensions and path.suffix not in allowed_extensions:
@@ -186,16 +216,16 @@ def discover_files(
             if path.name not in allowed_extensions:
                 continue
 
-        # Skip very large files to avoid memory issues
+        # Single stat per file (reusing the walk's DirEntry): skips deleted files (git ls-files
+        # might list them), files we can't stat, and very large files to avoid memory issues
         try:
-            file_size = path.stat().st_size
-            max_file_size = 50 * 1024 * 1024  # 50MB limit
-            if file_size > max_file_size:
-                continue
+            file_size = entry.stat().st_size if entry is not None else os.stat(path_str).st_size
         except OSError:
-            # Skip files we can't stat
+            continue
+        max_file_size = 50 * 1024 * 1024  # 50MB limit
+        if file_size > max_file_size:
             continue
 
-        files.append(path)
+        files.append((path, file_size))
 
     return files
@@ -5,68 +5,109 @@ import re
 from pathlib import Path
 from typing import List, Dict, Any
 
+from .line_index import matching_line_numbers
+
 
 # Pre-compiled secret patterns for performance
 SECRET_PATTERNS = [
     # API Keys and Tokens
-    (r'(?i)(api[_-]?key|apikey)\s*[=:]\s*["\']?([a-zA-Z0-9_-]{20,})["\']?', "api_key", 0.8),
-    (r'(?i)(secret[_-]?key|secretkey)\s*[=:]\s*["\']?([a-zA-Z0-9_-]{20,})["\']?', "secret_key", 0.8),
-    (r'(?i)(access[_-]?token|accesstoken)\s*[=:]\s*["\']?([a-zA-Z0-9_-]{20,})["\']?', "access_token", 0.8),
-    (r'(?i)(bearer[_-]?token|bearertoken)\s*[=:]\s*["\']?([a-zA-Z0-9_-]{20,})["\']?', "bearer_token", 0.8),
+    (re.compile(r'(?i)(api[_-]?key|apikey)\s*[=:]\s*["\']?([a-zA-Z0-9_-]{20,})["\']?'), "api_key", 0.8),
+    (re.compile(r'(?i)(secret[_-]?key|secretkey)\s*[=:]\s*["\']?([a-zA-Z0-9_-]{20,})["\']?'), "secret_key", 0.8),
+    (re.compile(r'(?i)(access[_-]?token|accesstoken)\s*[=:]\s*["\']?([a-zA-Z0-9_-]{20,})["\']?'), "access_token", 0.8),
+    (re.compile(r'(?i)(bearer[_-]?token|bearertoken)\s*[=:]\s*["\']?([a-zA-Z0-9_-]{20,})["\']?'), "bearer_token", 0.8),
 
     # Passwords
-    (r'(?i)(password|passwd|pwd)\s*[=:]\s*["\']?([^"\s]{8,})["\']?', "password", 0.7),
-    (r'(?i)(db[_-]?password|dbpasswd)\s*[=:]\s*["\']?([^"\s]{4,})["\']?', "db_password", 0.8),
+    (re.compile(r'(?i)(password|passwd|pwd)\s*[=:]\s*["\']?([^"\s]{8,})["\']?'), "password", 0.7),
+    (re.compile(r'(?i)(db[_-]?password|dbpasswd)\s*[=:]\s*["\']?([^"\s]{4,})["\']?'), "db_password", 0.8),
 
     # Private Keys (basic patterns)
-    (r'-----BEGIN\s+(?:RSA\s+)?PRIVATE\s+KEY-----', "private_key", 0.95),
-    (r'-----BEGIN\s+EC\s+PRIVATE\s+KEY-----', "ec_private_key", 0.95),
-    (r'-----BEGIN\s+OPENSSH\s+PRIVATE\s+KEY-----', "openssh_private_key", 0.95),
+    (re.compile(r'-----BEGIN\s+(?:RSA\s+)?PRIVATE\s+KEY-----'), "private_key", 0.95),
+    (re.compile(r'-----BEGIN\s+EC\s+PRIVATE\s+KEY-----'), "ec_private_key", 0.95),
+    (re.compile(r'-----BEGIN\s+OPENSSH\s+PRIVATE\s+KEY-----'), "openssh_private_key", 0.95),
 
-    # JWT Tokens
-    (r'eyJ[A-Za-z0-9_-]*\.eyJ[A-Za-z0-9_-]*\.[A-Za-z0-9_-]*', "jwt_token", 0.9),
+    # JWT Tokens. Only the first eyJ of a run of token characters is tried (any later one
+    # reaches the same '.'), with the characters before it consumed atomically by a
+    # captured lookahead and backreference; starting at every eyJ rescanned the run
+    # each time, quadratic on a long line of them. The token itself is group 2.
+    (re.compile(r'(?<![A-Za-z0-9_-])(?=([A-Za-z0-9_-]*?)eyJ)\1(eyJ[A-Za-z0-9_-]*\.eyJ[A-Za-z0-9_-]*\.[A-Za-z0-9_-]*)'),
+     "jwt_token", 0.9),
 
     # AWS Credentials
-    (r'(?i)(aws[_-]?access[_-]?key[_-]?id|aws_access_key_id)\s*[=:]\s*["\']?(AKIA[0-9A-Z]{16})["\']?', "aws_access_key", 0.95),
-    (r'(?i)(aws[_-]?secret[_-]?access[_-]?key|aws_secret_access_key)\s*[=:]\s*["\']?([a-zA-Z0-9/+=]{40})["\']?', "aws_secret_key", 0.95),
+    (re.compile(r'(?i)(aws[_-]?access[_-]?key[_-]?id|aws_access_key_id)\s*[=:]\s*["\']?(AKIA[0-9A-Z]{16})["\']?'), "aws_access_key", 0.95),
+    (re.compile(r'(?i)(aws[_-]?secret[_-]?access[_-]?key|aws_secret_access_key)\s*[=:]\s*["\']?([a-zA-Z0-9/+=]{40})["\']?'), "aws_secret_key", 0.95),
 
     # Generic base64-like strings (potential secrets)
-    (r'(?i)(key|token|secret)\s*[=:]\s*["\']?([a-zA-Z0-9+/=]{20,})["\']?', "base64_secret", 0.6),
+    (re.compile(r'(?i)(key|token|secret)\s*[=:]\s*["\']?([a-zA-Z0-9+/=]{20,})["\']?'), "base64_secret", 0.6),
 
     # Hardcoded credentials in code
-    (r'(?i)["\']((?:admin|root|user|test)@[\w.-]+):([^"\s]{4,})["\']', "hardcoded_credential", 0.85),
+    (re.compile(r'(?i)["\']((?:admin|root|user|test)@[\w.-]+):([^"\s]{4,})["\']'), "hardcoded_credential", 0.85),
     # Generic password patterns
-    (r'(?i)password\s*[:=]\s*["\']([^"\']{8,})["\']', "password", 0.7),
+    (re.compile(r'(?i)password\s*[:=]\s*["\']([^"\']{8,})["\']'), "password", 0.7),
 ]
 
+# Upper-cased byte literals at least one of SECRET_PATTERNS needs to match
+SECRET_KEYWORDS = (b"KEY", b"TOKEN", b"SECRET", b"PASSW", b"PWD", b"PRIVATE", b"EYJ", b"@")
+
+# Lower-cased literals a line must contain for each secret type's patterns to match
+SECRET_ANCHORS = {
+    "api_key": ("key",),
+    "secret_key": ("key",),
+    "access_token": ("token",),
+    "bearer_token": ("token",),
+    "password": ("passw", "pwd"),
+    "db_password": ("passw",),
+    "private_key": ("-----begin",),
+    "ec_private_key": ("-----begin",),
+    "openssh_private_key": ("-----begin",),
+    "jwt_token": ("eyj",),
+    "aws_access_key": ("key",),
+    "aws_secret_key": ("key",),
+    "base64_secret": ("key", "token", "secret"),
+    "hardcoded_credential": ("@",),
+}
+
+# Any of the anchors above, used to find candidate lines in a single pass
+SECRET_ANCHOR_PATTERN = re.compile(
+    '|'.join(re.escape(anchor) for anchor in sorted({a for anchors in SECRET_ANCHORS.values() for a in anchors})),
+    re.IGNORECASE,
+)
+
 # Allowlist patterns (false positives to ignore)
 ALLOWLIST_PATTERNS = [
-    r'(?i)example\.com',
-    r'(?i)your[_-]?domain',
-    r'(?i)placeholder',
-    r'(?i)sample[_-]?data',
-    r'(?i)test[_-]?key',
-    r'(?i)dummy[_-]?value',
-    r'(?i)CHANGE[_-]?ME',
-    r'(?i)REPLACE[_-]?WITH',
-    r'xxx+',  # Common placeholder
-    r'\*+',  # Starred out values (one or more asterisks)
+    re.compile(r'example\.com', re.IGNORECASE),
+    re.compile(r'your[_-]?domain', re.IGNORECASE),
+    re.compile(r'placeholder', re.IGNORECASE),
+    re.compile(r'sample[_-]?data', re.IGNORECASE),
+    re.compile(r'test[_-]?key', re.IGNORECASE),
+    re.compile(r'dummy[_-]?value', re.IGNORECASE),
+    re.compile(r'CHANGE[_-]?ME', re.IGNORECASE),
+    re.compile(r'REPLACE[_-]?WITH', re.IGNORECASE),
+    re.compile(r'xxx+', re.IGNORECASE),  # Common placeholder
+    re.compile(r'\*+', re.IGNORECASE),  # Starred out values (one or more asterisks)
 ]
 
+# Mixed-case identifiers such as camelCase or PascalCase
+CAMEL_CASE_PATTERN = re.compile(r'[a-z][A-Z]|[A-Z][a-z]')
+
 
 def detect_secrets(content: str, file_path: Path) -> List[Dict[str, Any]]:
     """Detect potential secrets and sensitive data in file content."""
     findings = []
     lines = content.splitlines()
 
-    for line_num, line in enumerate(lines, 1):
+    # Only lines containing an anchor can match any secret pattern
+    for line_num in matching_line_numbers(content, SECRET_ANCHOR_PATTERN):
+        line = lines[line_num - 1]
+
         # Skip comments and documentation
         if _is_comment_or_docstring(line, file_path):
             continue
 
+        line_lower = line.lower()
         for pattern, secret_type, confidence in SECRET_PATTERNS:
-            matches = re.finditer(pattern, line)
-            for match in matches:
+            if not any(anchor in line_lower for anchor in SECRET_ANCHORS[secret_type]):
+                continue
+            for match in pattern.finditer(line):
                 # Extract the secret value based on the pattern
                 if len(match.groups()) >= 2:
                     secret_value = match.group(2)
@@ -136,7 +177,7 @@ def _looks_like_variable_reference(secret_value: str) -> bool:
         return True
 
     # Check for camelCase or PascalCase (common in programming)
-    if re.search(r'[a-z][A-Z]|[A-Z][a-z]', secret_value):
+    if CAMEL_CASE_PATTERN.search(secret_value):
         return True
 
     # Check for snake_case
@@ -149,7 +190,7 @@ def _looks_like_variable_reference(secret_value: str) -> bool:
 def _should_ignore_secret(secret_value: str) -> bool:
     """Check if secret should be ignored based on allowlist."""
     secret_lower = secret_value.lower()
-    return any(re.search(pattern, secret_lower, re.IGNORECASE) for pattern in ALLOWLIST_PATTERNS)
+    return any(pattern.search(secret_lower) for pattern in ALLOWLIST_PATTERNS)
 
 
 def _validate_secret(secret_value: str, secret_type: str) -> bool: